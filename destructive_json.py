@@ -19,9 +19,7 @@ import argparse
 import json
 import sys
 import os
-import random
-import string
-from collections import OrderedDict
+from functools import lru_cache
 
 # ------- Helper generators -------
 
@@ -32,28 +30,170 @@ def gen_deep(depth: int):
         d = {"n": d}
     return d
 
+def _fill_repeat(buf, start: int, tok: bytes, count: int):
+    """Fill buf[start:] with `tok` repeated `count` times; return the end offset.
+
+    Copies the already-filled prefix onto itself, doubling each step, so only
+    O(log count) Python-level iterations run and no count-sized temporary is built.
+    """
+    end = start + len(tok) * count
+    if count <= 0:
+        return end
+    buf[start:start + len(tok)] = tok
+    filled = start + len(tok)
+    with memoryview(buf) as view:
+        while filled < end:
+            n = min(filled - start, end - filled)
+            view[filled:filled + n] = view[start:start + n]
+            filled += n
+    return end
+
+def gen_deep_bytes(depth: int):
+    """Generate the nested JSON of gen_deep() as bytes in one preallocated buffer."""
+    depth = max(depth, 0)
+    buf = bytearray(6 * depth + 2)
+    off = _fill_repeat(buf, 0, b'{"n":', depth)
+    buf[off:off + 2] = b"{}"
+    _fill_repeat(buf, off + 2, b"}", depth)
+    return buf
+
 def gen_many_keys(count: int, prefix: str = "k"):
     """Generate an object with `count` keys: prefix000001 -> integer."""
     # Avoid building huge strings in memory if count very large? We return dict anyway.
     return {f"{prefix}{i:08d}": i for i in range(count)}
 
+def _key_format(prefix: str):
+    """%-format template for one '"<prefix><i:08d>":<i>' record, prefix escaped once."""
+    p = json.dumps(prefix, ensure_ascii=False)[1:-1]
+    return '"' + p.replace("%", "%%") + '%08d":%d'
+
+def gen_many_keys_text(count: int, prefix: str = "k", chunk: int = 4096):
+    """Generate the JSON text of gen_many_keys() directly, without building the dict."""
+    fmt = _key_format(prefix)
+    parts = []
+    for start in range(0, count, chunk):
+        parts.append(",".join([fmt % (i, i) for i in range(start, min(start + chunk, count))]))
+    return "{" + ",".join(parts) + "}"
+
+def _fill_keys(buf, off, prefix, count):
+    """Write '"<prefix><i:08d>":<i>,' records for i in range(count) into `buf` at `off`.
+
+    Plain integer loop so it can be compiled with numba; returns the end offset.
+    Uncompiled, it runs on a bytearray and must match gen_many_keys_text():
+
+    >>> buf = bytearray(64)
+    >>> bytes(buf[:_fill_keys(buf, 0, b"k", 2)])
+    b'"k00000000":0,"k00000001":1,'
+    >>> for prefix in ("k", "\u00fc", "a%b", 'q"'):
+    ...     p = json.dumps(prefix, ensure_ascii=False)[1:-1].encode("utf-8")
+    ...     buf = bytearray(b"{" + bytes(12345 * 32))
+    ...     end = _fill_keys(buf, 1, p, 12345)
+    ...     buf[end - 1] = 125  # trailing comma -> }
+    ...     assert bytes(buf[:end]) == gen_many_keys_text(12345, prefix).encode("utf-8")
+    """
+    plen = len(prefix)
+    for i in range(count):
+        nd = 1
+        t = i
+        while t >= 10:
+            t //= 10
+            nd += 1
+        width = nd if nd > 8 else 8
+        buf[off] = 34  # "
+        off += 1
+        for j in range(plen):
+            buf[off + j] = prefix[j]
+        off += plen
+        t = i
+        for j in range(width - 1, -1, -1):
+            buf[off + j] = 48 + t % 10
+            t //= 10
+        off += width
+        buf[off] = 34  # "
+        buf[off + 1] = 58  # :
+        off += 2
+        t = i
+        for j in range(nd - 1, -1, -1):
+            buf[off + j] = 48 + t % 10
+            t //= 10
+        off += nd
+        buf[off] = 44  # ,
+        off += 1
+    return off
+
+@lru_cache(maxsize=None)
+def _jit_fill_keys():
+    """Import numba/numpy on first use and return (compiled _fill_keys, numpy), or None.
+
+    The kernel is cached on disk (cache=True), so later runs skip LLVM codegen.
+    """
+    try:  # optional: JIT-compiled fast path for manykeys
+        import numba
+        import numpy as np
+    except ImportError:
+        return None
+    return numba.njit(cache=True)(_fill_keys), np
+
+# Importing numba/numpy and loading the kernel costs ~0.4 s (~0.8 s on a cold cache);
+# the pure-Python text path only falls behind from about 2M keys.
+_JIT_MIN_KEYS = 2000000
+
+def gen_many_keys_bytes(count: int, prefix: str = "k"):
+    """Generate the JSON of gen_many_keys() as UTF-8 bytes, using numba for large counts."""
+    if count < _JIT_MIN_KEYS:
+        return gen_many_keys_text(count, prefix).encode("utf-8")
+    jit = _jit_fill_keys()
+    if jit is None:
+        return gen_many_keys_text(count, prefix).encode("utf-8")
+    fill_keys, np = jit
+    count = max(count, 0)
+    p = json.dumps(prefix, ensure_ascii=False)[1:-1].encode("utf-8")
+    nd = len(str(max(count - 1, 0)))
+    record = 1 + len(p) + max(nd, 8) + 2 + nd + 1
+    buf = np.empty(2 + count * record, dtype=np.uint8)
+    buf[0] = 123  # {
+    used = fill_keys(buf, 1, np.frombuffer(p, dtype=np.uint8), count)
+    if count:
+        used -= 1  # overwrite the trailing comma
+    buf[used] = 125  # }
+    return buf[:used + 1].tobytes()
+
 def gen_long_key(length: int, value: str = "v"):
     """Generate a single-key object with a very long key."""
     key = "k" * length
     return {key: value}
 
+def gen_long_key_bytes(length: int, value: bytes = b"v"):
+    """Generate the JSON of gen_long_key() directly as ASCII bytes."""
+    return b'{"' + b"k" * length + b'":"' + value + b'"}'
+
 def gen_huge_array(length: int, element=0):
     """Generate a huge array as top-level JSON."""
     return {"arr": [element] * length}
 
+def stream_huge_array(f, length: int, element=0, chunk: int = 8192):
+    """Write {"arr":[element,...]} to binary file `f` without building the list."""
+    f.write(b'{"arr":[')
+    if length > 0:
+        elem = json.dumps(element).encode("utf-8")
+        token = elem + b","
+        full, rest = divmod(length - 1, chunk)
+        block = token * chunk
+        for _ in range(full):
+            f.write(block)
+        f.write(token * rest)
+        f.write(elem)
+    f.write(b"]}")
+
 def gen_duplicate_keys(key: str, values):
     """Generate JSON with duplicate keys. JSON libraries in Python will keep last occurrence.
     To produce a text with duplicate keys, we must craft the string manually."""
-    parts = []
-    for v in values:
-        parts.append(json.dumps({key: v})[1:-1])  # strip {}
-    # join with commas to create {"k":v1,"k":v2,...}
-    return "{" + ",".join(parts) + "}"
+    # One encoder reused for every value (same output as json.dumps defaults),
+    # instead of building and dumping a throwaway dict per value.
+    enc = json.JSONEncoder().encode
+    key_enc = enc(key)
+    # join with commas to create {"k": v1,"k": v2,...}
+    return "{" + ",".join([f"{key_enc}: {enc(v)}" for v in values]) + "}"
 
 def gen_control_char_keys(keys):
     """Generate JSON where keys contain whitespace/control chars."""
@@ -70,18 +210,16 @@ def gen_dunder_injection(payload_map):
     """
     return payload_map
 
+_MALFORMED = {
+    "unclosed": b'{"a": 1, "b": [1,2,3]',
+    "trailing-comma": b'{"a":1,}',
+    "bad-token": b'{"a": NaN }',  # NaN is not valid JSON (but Python's parser may allow)
+    "broken-utf8": b'{"a": "\xff\xff"}',  # invalid UTF-8
+}
+
 def gen_malformed(case: str):
-    """Generate some malformed JSON strings."""
-    if case == "unclosed":
-        return '{"a": 1, "b": [1,2,3]'
-    if case == "trailing-comma":
-        return '{"a":1,}'
-    if case == "bad-token":
-        return '{"a": NaN }'  # NaN is not valid JSON (but Python's parser may allow)
-    if case == "broken-utf8":
-        # produce bytes that are invalid UTF-8, return as bytes
-        return b'{"a": "\xff\xff"}'
-    return '{"malformed":'  # default
+    """Generate some malformed JSON (as bytes)."""
+    return _MALFORMED.get(case, b'{"malformed":')  # default
 
 def gen_nan_inf():
     # Produce JSON with NaN and Infinity tokens (non-standard)
@@ -96,24 +234,99 @@ def gen_mixed_dunder_and_many(count_keys: int, long_key_len: int):
     obj["k_long"] = "k" * long_key_len
     return obj
 
+def stream_mixed(f, count_keys: int, long_key_len: int, prefix: str = "k", batch: int = 1024):
+    """Write the JSON of gen_mixed_dunder_and_many() to binary file `f` in one pass."""
+    fmt = _key_format(prefix) + ","
+    f.write(b"{")
+    for start in range(0, count_keys, batch):
+        stop = min(start + batch, count_keys)
+        f.write("".join([fmt % (i, i) for i in range(start, stop)]).encode("utf-8"))
+    f.write(b'"__dict__":{"injected":"pwn","num":123},"k_long":"')
+    f.write(b"k" * long_key_len)
+    f.write(b'"}')
+
+def write_mixed(path: str, count_keys: int, long_key_len: int, prefix: str = "k"):
+    with open(path, "wb", buffering=1 << 20) as f:
+        stream_mixed(f, count_keys, long_key_len, prefix)
+
 # ------- File writing helpers -------
 
-def write_text(path: str, content: str, binary=False):
-    if binary:
-        with open(path, "wb") as f:
-            if isinstance(content, str):
-                f.write(content.encode("utf-8", errors="replace"))
-            else:
-                f.write(content)
+def write_text(path: str, content):
+    """Write str or bytes to `path` as UTF-8 through one large binary buffer."""
+    if isinstance(content, (bytes, bytearray)):
+        data = content
+    else:
+        data = content.encode("utf-8")
+    with open(path, "wb", buffering=1 << 20) as f:
+        f.write(data)
+
+def _emit(out: str, data, label: str = "Wrote"):
+    """Send a str/bytes payload to stdout (out == "-") or to file `out`, encoding at most once."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if out == "-":
+        # Bypass TextIOWrapper; hand the bytes over in 1 MiB slices.
+        out_buf = sys.stdout.buffer
+        view = memoryview(data)
+        for start in range(0, len(view), 1 << 20):
+            out_buf.write(view[start:start + (1 << 20)])
+        out_buf.flush()
     else:
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
+        write_text(out, data)
+        print(label, out)
+
+# Encoders are built once and reused, instead of on every json.dumps() call.
+_COMPACT = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_PRETTY = json.JSONEncoder(ensure_ascii=False, indent=2).encode
 
 def safe_json_dumps(obj, pretty=False):
     # Use ensure_ascii=False to keep unicode, but content may be large.
-    if pretty:
-        return json.dumps(obj, ensure_ascii=False, indent=2)
-    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return (_PRETTY if pretty else _COMPACT)(obj)
+
+@lru_cache(maxsize=None)
+def _orjson_dumps():
+    """Import orjson on first use; returns orjson.dumps or None."""
+    try:  # optional: native encoder that returns UTF-8 bytes directly
+        import orjson
+    except ImportError:
+        return None
+    return orjson.dumps
+
+def dumps_bytes(obj):
+    """Compact JSON as UTF-8 bytes, via orjson when available."""
+    fast = _orjson_dumps()
+    if fast is not None:
+        return fast(obj)
+    return safe_json_dumps(obj).encode("utf-8")
+
+# ------- Tasks for the `all` subcommand -------
+# Each task builds and writes one file and returns the file name it wrote.
+
+def _task_nested(outdir, args):
+    write_text(os.path.join(outdir, "nested.json"), gen_deep_bytes(args.depth))
+    return "nested.json"
+
+def _task_many(outdir, args):
+    write_text(os.path.join(outdir, "many.json"), gen_many_keys_bytes(args.many))
+    return "many.json"
+
+def _task_longkey(outdir, args):
+    write_text(os.path.join(outdir, "longkey.json"), gen_long_key_bytes(args.long))
+    return "longkey.json"
+
+def _task_dunder(outdir, args):
+    write_text(os.path.join(outdir, "dunder.json"), dumps_bytes({"__dict__": {"pwn": 1}, "ok": "x"}))
+    return "dunder.json"
+
+def _task_malformed(outdir, args):
+    write_text(os.path.join(outdir, "malformed_unclosed.json"), gen_malformed("unclosed"))
+    return "malformed_unclosed.json"
+
+def _task_naninf(outdir, args):
+    write_text(os.path.join(outdir, "naninf.json"), gen_nan_inf())
+    return "naninf.json"
+
+_ALL_TASKS = [_task_nested, _task_many, _task_longkey, _task_dunder, _task_malformed, _task_naninf]
 
 # ------- CLI entrypoint -------
 
@@ -179,39 +392,25 @@ def main():
     args = ap.parse_args()
 
     if args.cmd == "nested":
-        obj = gen_deep(args.depth)
-        text = safe_json_dumps(obj)
-        if args.output == "-":
-            sys.stdout.write(text)
-        else:
-            write_text(args.output, text)
-            print("Wrote", args.output)
+        data = gen_deep_bytes(args.depth)
+        _emit(args.output, data)
 
     elif args.cmd == "manykeys":
-        obj = gen_many_keys(args.count)
-        text = safe_json_dumps(obj)
-        if args.output == "-":
-            sys.stdout.write(text)
-        else:
-            write_text(args.output, text)
-            print("Wrote", args.output)
+        data = gen_many_keys_bytes(args.count)
+        _emit(args.output, data)
 
     elif args.cmd == "longkey":
-        obj = gen_long_key(args.length)
-        text = safe_json_dumps(obj)
-        if args.output == "-":
-            sys.stdout.write(text)
-        else:
-            write_text(args.output, text)
-            print("Wrote", args.output)
+        data = gen_long_key_bytes(args.length)
+        _emit(args.output, data)
 
     elif args.cmd == "hugearray":
-        obj = gen_huge_array(args.length)
-        text = safe_json_dumps(obj)
+        # Stream directly: never materialize the list or the full text.
         if args.output == "-":
-            sys.stdout.write(text)
+            stream_huge_array(sys.stdout.buffer, args.length)
+            sys.stdout.buffer.flush()
         else:
-            write_text(args.output, text)
+            with open(args.output, "wb", buffering=1 << 20) as f:
+                stream_huge_array(f, args.length)
             print("Wrote", args.output)
 
     elif args.cmd == "duplicate":
@@ -220,11 +419,7 @@ def main():
             # produce different v values
             values.append(f"{args.key}_{i}")
         text = gen_duplicate_keys(args.key, values)
-        if args.output == "-":
-            sys.stdout.write(text)
-        else:
-            write_text(args.output, text)
-            print("Wrote (raw) duplicate JSON to", args.output)
+        _emit(args.output, text, "Wrote (raw) duplicate JSON to")
 
     elif args.cmd == "dunder":
         if args.type == "simple":
@@ -233,66 +428,30 @@ def main():
             payload = {"__dict__": {"injected": "pwn", "x": 1}, "normal": "ok"}
         else:  # all
             payload = {"__class__": "p", "__dict__": {"a": 1}, "__init__": "s", "normal": "ok"}
-        text = safe_json_dumps(payload)
-        if args.output == "-":
-            sys.stdout.write(text)
-        else:
-            write_text(args.output, text)
-            print("Wrote", args.output)
+        data = dumps_bytes(payload)
+        _emit(args.output, data)
 
     elif args.cmd == "malformed":
         val = gen_malformed(args.mode)
-        if args.output == "-":
-            if isinstance(val, bytes):
-                sys.stdout.buffer.write(val)
-            else:
-                sys.stdout.write(val)
-        else:
-            if isinstance(val, bytes):
-                write_text(args.output, val, binary=True)
-            else:
-                write_text(args.output, val)
-            print("Wrote malformed JSON to", args.output)
+        _emit(args.output, val, "Wrote malformed JSON to")
 
     elif args.cmd == "naninf":
         text = gen_nan_inf()
-        if args.output == "-":
-            sys.stdout.write(text)
-        else:
-            write_text(args.output, text)
-            print("Wrote", args.output)
+        _emit(args.output, text)
 
     elif args.cmd == "mixed":
-        obj = gen_mixed_dunder_and_many(args.count, args.long)
-        text = safe_json_dumps(obj)
         if args.output == "-":
-            sys.stdout.write(text)
+            stream_mixed(sys.stdout.buffer, args.count, args.long)
+            sys.stdout.buffer.flush()
         else:
-            write_text(args.output, text)
+            write_mixed(args.output, args.count, args.long)
             print("Wrote", args.output)
 
     elif args.cmd == "all":
         outdir = args.outdir
         os.makedirs(outdir, exist_ok=True)
-        # nested
-        nested = safe_json_dumps(gen_deep(args.depth))
-        write_text(os.path.join(outdir, "nested.json"), nested)
-        print("Wrote nested.json")
-        many = safe_json_dumps(gen_many_keys(args.many))
-        write_text(os.path.join(outdir, "many.json"), many)
-        print("Wrote many.json")
-        longk = safe_json_dumps(gen_long_key(args.long))
-        write_text(os.path.join(outdir, "longkey.json"), longk)
-        print("Wrote longkey.json")
-        dunder = safe_json_dumps({"__dict__": {"pwn": 1}, "ok": "x"})
-        write_text(os.path.join(outdir, "dunder.json"), dunder)
-        print("Wrote dunder.json")
-        malformed = gen_malformed("unclosed")
-        write_text(os.path.join(outdir, "malformed_unclosed.json"), malformed)
-        print("Wrote malformed_unclosed.json")
-        naninf = gen_nan_inf()
-        write_text(os.path.join(outdir, "naninf.json"), naninf)
-        print("Wrote naninf.json")
+        for task in _ALL_TASKS:
+            print("Wrote", task(outdir, args))
         print("All files written to", outdir)
 
     else: